@@ -1,106 +1,251 @@
 from flask import Flask, request, jsonify, render_template, Response
 import sqlite3
+import orjson
 from datetime import datetime
 import os
 import csv
-from io import StringIO
-from collections import Counter
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+import queue
+import re
+from types import MappingProxyType
 import string
-import random
 
 app = Flask(__name__)
 
-def get_db_connection():
-    """Get a connection to the SQLite database."""
-    conn = sqlite3.connect('rsvp_database.db')
+DATABASE = 'rsvp_database.db'
+
+# Every passenger gets the same code and standing room on this airline
+CONFIRMATION_CODE = '4Z4L34'
+SEAT_NUMBER = 'STANDING'
+
+# Departure at 12:00, Estimated Arrival at 14:00
+DEPARTURE_TIME = '12:00'
+BOARDING_TIME = '14:00'  # This will be used as arrival time
+
+# Same check as the booking form's client-side validation
+EMAIL_RE = re.compile(r'^[^\s@]+@[^\s@]+\.[^\s@]+$')
+
+# New meal choices are fixed bento options
+VALID_MEAL_CHOICES = MappingProxyType({
+    'shrimp-aglio-olio': '🍤 Shrimp Linguine Aglio Olio',
+    'creamy-chicken-pomodoro': '🍗 Creamy Chicken Pomodoro',
+    'carbonara-funghi': '🍄 Carbonara al Funghi (V)'
+})
+
+# Legacy values are still accepted (do not reject old data already stored)
+LEGACY_MEAL_VALUES = frozenset(['none', 'vegetarian', 'vegan', 'gluten-free', 'dairy-free', 'nut-free', 'other'])
+
+# Bento box + legacy mapping used in summaries and the manifest
+DIETARY_LABELS = MappingProxyType({
+    'shrimp-aglio-olio': 'Shrimp Linguine Aglio Olio',
+    'creamy-chicken-pomodoro': 'Creamy Chicken Pomodoro',
+    'carbonara-funghi': 'Carbonara al Funghi (V)',
+    # legacy
+    'none': 'Standard Meal Service',
+    'vegetarian': 'Vegetarian Meals (VGML)',
+    'vegan': 'Vegan Meals (VEGN)',
+    'gluten-free': 'Gluten-Free Meals (GFML)',
+    'dairy-free': 'Dairy-Free Meals (DFML)',
+    'nut-free': 'Nut-Free Meals (NFML)',
+    'other': 'Special Dietary Requests'
+})
+
+# Connections are kept open and reused across requests instead of being
+# opened and closed by every handler.
+_pool = queue.LifoQueue()
+
+def _connect():
+    """Open a new SQLite connection with the per-connection pragmas applied."""
+    conn = sqlite3.connect(DATABASE, check_same_thread=False)
     conn.row_factory = sqlite3.Row  # This enables column access by name
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-20000')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')
     return conn
 
+@contextmanager
+def db():
+    """Borrow a pooled database connection for the duration of the block."""
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _connect()
+    try:
+        yield conn
+    finally:
+        # Never hand a connection with an open transaction back to the pool
+        if conn.in_transaction:
+            conn.rollback()
+        _pool.put(conn)
+
+def ojsonify(obj, status=200):
+    """Like jsonify, but serialized with orjson (including dataclasses)."""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+class Echo:
+    """File-like object that returns what is written, for streaming csv rows."""
+    
+    def write(self, value):
+        return value
+
 def init_database():
     """Initialize the database if it doesn't exist."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Create RSVP table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS rsvp (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date_created DATETIME DEFAULT CURRENT_TIMESTAMP,
-            email TEXT NOT NULL,
-            dietary_option TEXT NOT NULL,
-            event_date DATE NOT NULL,
-            special_dietary_details TEXT
-        )
-    ''')
-    
-    # Add special_dietary_details column if it doesn't exist (for existing databases)
+    with closing(_connect()) as conn:
+        with conn:
+            cursor = conn.cursor()
+            
+            # WAL lets readers proceed while a write is in progress; the setting is
+            # persistent, so it only needs to be applied once per database file.
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
+            # Create RSVP table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS rsvp (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date_created DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    email TEXT NOT NULL,
+                    dietary_option TEXT NOT NULL,
+                    event_date DATE NOT NULL,
+                    special_dietary_details TEXT
+                )
+            ''')
+            
+            # Add special_dietary_details column if it doesn't exist (for existing databases)
+            cursor.execute('PRAGMA table_info(rsvp)')
+            if 'special_dietary_details' not in {row['name'] for row in cursor}:
+                try:
+                    cursor.execute('ALTER TABLE rsvp ADD COLUMN special_dietary_details TEXT')
+                except sqlite3.OperationalError as e:
+                    # Another process added it between the probe and the ALTER
+                    if 'duplicate column name' not in str(e):
+                        raise
+            
+            # Covering index so listings and the manifest read rows in date order
+            # straight from the index instead of sorting the table
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_rsvp_date_created
+                ON rsvp (date_created DESC, id, email, dietary_option, event_date)
+            ''')
+            
+            # Lets the meal summary be counted from the index alone
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_rsvp_dietary ON rsvp (dietary_option)')
+            
+            # Create configuration table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS flight_config (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+        # Refresh planner statistics where they are missing or stale
+        conn.execute('PRAGMA optimize')
+
+@dataclass(frozen=True, slots=True)
+class FlightConfig:
+    """Snapshot of the flight settings and display forms of the departure date."""
+    values: dict[str, str]
+    formatted_date: str | None = None
+    formatted_departure: str | None = None
+
+# Flight configuration only changes through configure.py, which bumps the
+# version row on every write. The whole table is cached in-process and only
+# reloaded when that row changes; each reload swaps in a new snapshot so
+# handlers never pair a date with strings built from a different reload.
+CONFIG_VERSION_KEY = '__version__'
+_flight_config = FlightConfig({})
+_config_version = None
+
+def load_flight_config():
+    """Get all configuration values, reloading them only if they changed."""
+    global _flight_config, _config_version
     try:
-        cursor.execute('ALTER TABLE rsvp ADD COLUMN special_dietary_details TEXT')
-    except:
-        pass  # Column already exists
-    
-    # Create configuration table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS flight_config (
-            key TEXT PRIMARY KEY,
-            value TEXT NOT NULL,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+        with db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT value FROM flight_config WHERE key = ?', (CONFIG_VERSION_KEY,))
+            result = cursor.fetchone()
+            version = result['value'] if result else None
+            
+            if version != _config_version or not _flight_config.values:
+                cursor.execute('SELECT key, value FROM flight_config WHERE key != ?', (CONFIG_VERSION_KEY,))
+                values = {row['key']: row['value'] for row in cursor}
+                formatted_date = formatted_departure = None
+                
+                if 'departure_date' in values:
+                    try:
+                        departure_date = datetime.strptime(values['departure_date'], '%Y-%m-%d').date()
+                        formatted_date = departure_date.strftime('%A, %B %d, %Y')
+                        formatted_departure = departure_date.strftime('%B %d, %Y')
+                    except ValueError:
+                        # Treat an unparseable date as not configured
+                        app.logger.error('Ignoring malformed departure date %r', values.pop('departure_date'))
+                
+                _flight_config = FlightConfig(values, formatted_date, formatted_departure)
+                _config_version = version
+    except sqlite3.Error:
+        pass  # Table not created yet; serve whatever is cached
+    return _flight_config
 
 def get_flight_config(key, default=None):
     """Get a configuration value from the database."""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT value FROM flight_config WHERE key = ?', (key,))
-        result = cursor.fetchone()
-        conn.close()
-        
-        return result['value'] if result else default
-    except:
-        return default
+    return load_flight_config().values.get(key, default)
 
 def get_departure_date():
     """Get the configured departure date."""
     return get_flight_config('departure_date')
 
+# Once a departure date is set it is never removed, so after the first
+# positive check the index page no longer needs to touch the database.
+_departure_configured = False
+
 def is_departure_date_configured():
     """Check if departure date is configured."""
-    return get_departure_date() is not None
+    global _departure_configured
+    if not _departure_configured:
+        _departure_configured = get_departure_date() is not None
+    return _departure_configured
 
-def generate_confirmation_code():
-    """Generate a 6-character confirmation code."""
-    return '4Z4L34'
+def get_meal_counts(conn):
+    """Count passengers per dietary option without loading individual rows."""
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT dietary_option, COUNT(*) AS count
+        FROM rsvp
+        GROUP BY dietary_option
+    ''')
+    return {row['dietary_option']: row['count'] for row in cursor}
 
-def generate_seat_number():
-    """Generate seat assignment - STANDING for this airline."""
-    return "STANDING"
+@dataclass(slots=True)
+class BoardingPass:
+    """Boarding pass details returned to the booking page."""
+    confirmation_code: str
+    passenger_email: str
+    flight_number: str
+    departure_date: str
+    formatted_departure: str
+    destination: str
+    seat_number: str
+    gate: str
+    boarding_time: str
+    departure_time: str
+    meal_preference: str
+    # Filled in on booking only; script.js appends special_dietary_details
+    # to the meal line when the legacy "other" option was chosen
+    special_dietary_details: str | None = None
+    meal_display: str | None = None
+    # Filled in on lookup only
+    booking_date: str | None = None
 
-def format_boarding_time(departure_date_str):
-    """Calculate departure and arrival times."""
-    try:
-        # Departure at 12:00, Estimated Arrival at 14:00
-        departure_date = datetime.strptime(departure_date_str, '%Y-%m-%d').date()
-        departure_time = "12:00"
-        boarding_time = "14:00"  # This will be used as arrival time
-        gate = f"A{random.randint(1, 20)}"
-        
-        return {
-            'departure_time': departure_time,
-            'boarding_time': boarding_time,
-            'gate': gate
-        }
-    except:
-        return {
-            'departure_time': "14:30",
-            'boarding_time': "13:45", 
-            'gate': "A12"
-        }
+def format_boarding_time(rsvp_id: int) -> dict[str, str]:
+    """Get departure and arrival times, with the gate derived from the booking."""
+    return {
+        'departure_time': DEPARTURE_TIME,
+        'boarding_time': BOARDING_TIME,
+        'gate': f"A{rsvp_id % 20 + 1}"
+    }
 
 @app.route('/')
 def index():
@@ -114,38 +259,38 @@ def index():
 def get_flight_config_api():
     """Get flight configuration information."""
     try:
-        departure_date = get_departure_date()
-        flight_number = get_flight_config('flight_number', 'AA-2025')
-        destination = get_flight_config('destination', 'Destination TBD')
+        config = load_flight_config()
+        departure_date = config.values.get('departure_date')
+        flight_number = config.values.get('flight_number', 'AA-2025')
+        destination = config.values.get('destination', 'Destination TBD')
         
         if not departure_date:
             return jsonify({'error': 'Flight departure date not configured'}), 400
         
-        # Format departure date for display
-        from datetime import datetime
-        date_obj = datetime.strptime(departure_date, '%Y-%m-%d').date()
-        formatted_date = date_obj.strftime('%A, %B %d, %Y')
-        
         return jsonify({
             'departure_date': departure_date,
-            'formatted_date': formatted_date,
+            'formatted_date': config.formatted_date,
             'flight_number': flight_number,
             'destination': destination,
             'configured': True
         })
         
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    except (sqlite3.Error, KeyError, ValueError):
+        app.logger.exception('Failed to load flight configuration')
+        return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/rsvp', methods=['POST'])
 def create_rsvp():
     """Create a new RSVP entry."""
     try:
         data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Invalid request body'}), 400
         
         # Check if departure date is configured
-        configured_date = get_departure_date()
-        if not configured_date:
+        config = load_flight_config()
+        configured_date = config.values.get('departure_date')
+        if not configured_date or config.formatted_departure is None:
             return jsonify({'error': 'Flight departure date not configured. Please contact airline administration.'}), 400
         
         # Validate required fields (event_date no longer required from user)
@@ -154,22 +299,24 @@ def create_rsvp():
             if field not in data or not data[field]:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
+        # Reject non-string values before they reach validation or the database
+        for field in ('email', 'dietary_option'):
+            if not isinstance(data[field], str):
+                return jsonify({'error': f'Invalid value for field: {field}'}), 400
+        
+        if not EMAIL_RE.fullmatch(data['email']):
+            return jsonify({'error': 'Invalid email address'}), 400
+        
         # New meal choices are fixed bento options; allow legacy submissions to still work.
-        valid_meal_choices = {
-            'shrimp-aglio-olio': '🍤 Shrimp Linguine Aglio Olio',
-            'creamy-chicken-pomodoro': '🍗 Creamy Chicken Pomodoro',
-            'carbonara-funghi': '🍄 Carbonara al Funghi (V)'
-        }
-
-        # Map possible legacy values to new (do not reject old data already stored)
-        legacy_values = set(['none','vegetarian','vegan','gluten-free','dairy-free','nut-free','other'])
-        if data['dietary_option'] not in valid_meal_choices and data['dietary_option'] not in legacy_values:
+        if data['dietary_option'] not in VALID_MEAL_CHOICES and data['dietary_option'] not in LEGACY_MEAL_VALUES:
             return jsonify({'error': 'Invalid meal selection'}), 400
 
         # Special dietary free-text no longer required; ignore incoming unless legacy "other" was used
         if data['dietary_option'] == 'other':
             # Keep previous behavior but make details optional (graceful degradation)
             special_text = data.get('special_dietary_details')
+            if special_text is not None and not isinstance(special_text, str):
+                return jsonify({'error': 'Invalid value for field: special_dietary_details'}), 400
             if not special_text:
                 # Accept but store None now
                 data['special_dietary_details'] = None
@@ -177,90 +324,73 @@ def create_rsvp():
         # Use configured departure date instead of user input
         event_date = configured_date
         
-        # Generate boarding pass data
-        confirmation_code = generate_confirmation_code()
-        seat_number = generate_seat_number()
-        flight_times = format_boarding_time(event_date)
-        
-        # Insert into database
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
         # Preserve legacy special dietary details only if legacy "other" option used
         special_dietary_details = data.get('special_dietary_details') if data['dietary_option'] == 'other' else None
 
-        cursor.execute('''
-            INSERT INTO rsvp (email, dietary_option, event_date, special_dietary_details)
-            VALUES (?, ?, ?, ?)
-        ''', (data['email'], data['dietary_option'], event_date, special_dietary_details))
-        
-        conn.commit()
-        rsvp_id = cursor.lastrowid
-        conn.close()
+        # Insert into database
+        with db() as conn, conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO rsvp (email, dietary_option, event_date, special_dietary_details)
+                VALUES (?, ?, ?, ?)
+                RETURNING id
+            ''', (data['email'], data['dietary_option'], event_date, special_dietary_details))
+            
+            rsvp_id = cursor.fetchone()['id']
+        
+        flight_times = format_boarding_time(rsvp_id)
         
         # Get flight configuration for boarding pass
-        flight_number = get_flight_config('flight_number', 'AA-2025')
-        destination = get_flight_config('destination', 'Destination TBD')
-        
-        # Format departure date for display
-        departure_date_obj = datetime.strptime(event_date, '%Y-%m-%d').date()
-        formatted_departure = departure_date_obj.strftime('%B %d, %Y')
+        flight_number = config.values.get('flight_number', 'AA-2025')
+        destination = config.values.get('destination', 'Destination TBD')
         
         # Create boarding pass data
-        boarding_pass = {
-            'confirmation_code': confirmation_code,
-            'passenger_email': data['email'],
-            'flight_number': flight_number,
-            'departure_date': event_date,
-            'formatted_departure': formatted_departure,
-            'destination': destination,
-            'seat_number': seat_number,
-            'gate': flight_times['gate'],
-            'boarding_time': flight_times['boarding_time'],
-            'departure_time': flight_times['departure_time'],
-            'meal_preference': data['dietary_option'],
-            'special_dietary_details': special_dietary_details,
-            'meal_display': valid_meal_choices.get(data['dietary_option'], data['dietary_option'])
-        }
+        boarding_pass = BoardingPass(
+            confirmation_code=CONFIRMATION_CODE,
+            passenger_email=data['email'],
+            flight_number=flight_number,
+            departure_date=event_date,
+            formatted_departure=config.formatted_departure,
+            destination=destination,
+            seat_number=SEAT_NUMBER,
+            gate=flight_times['gate'],
+            boarding_time=flight_times['boarding_time'],
+            departure_time=flight_times['departure_time'],
+            meal_preference=data['dietary_option'],
+            special_dietary_details=special_dietary_details,
+            meal_display=VALID_MEAL_CHOICES.get(data['dietary_option'], data['dietary_option'])
+        )
         
-        return jsonify({
+        return ojsonify({
             'message': 'RSVP submitted successfully!',
             'rsvp_id': rsvp_id,
             'departure_date': event_date,
             'boarding_pass': boarding_pass
-        }), 201
+        }, status=201)
         
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    except (sqlite3.Error, KeyError, ValueError):
+        app.logger.exception('Failed to create RSVP')
+        return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/rsvp', methods=['GET'])
 def get_rsvps():
     """Get all RSVP entries."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, date_created, email, dietary_option, event_date
-            FROM rsvp
-            ORDER BY date_created DESC
-        ''')
-        
-        rsvps = []
-        for row in cursor.fetchall():
-            rsvps.append({
-                'id': row['id'],
-                'date_created': row['date_created'],
-                'email': row['email'],
-                'dietary_option': row['dietary_option'],
-                'event_date': row['event_date']
-            })
-        
-        conn.close()
-        return jsonify(rsvps)
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        with db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, date_created, email, dietary_option, event_date
+                FROM rsvp
+                ORDER BY date_created DESC
+            ''')
+            
+            rsvps = [dict(row) for row in cursor]
+        
+        return ojsonify(rsvps)
+        
+    except (sqlite3.Error, KeyError, ValueError):
+        app.logger.exception('Failed to list RSVPs')
+        return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/admin')
 def admin():
@@ -271,207 +401,172 @@ def admin():
 def download_rsvp_csv():
     """Download RSVP data as CSV with summary statistics."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, date_created, email, dietary_option, event_date
-            FROM rsvp
-            ORDER BY date_created DESC
-        ''')
+        # Only the per-meal counts are needed up front; passenger rows are
+        # streamed afterwards so the manifest is never held in memory.
+        with db() as conn:
+            dietary_counts = get_meal_counts(conn)
         
-        rsvps = cursor.fetchall()
-        conn.close()
-        
-        if not rsvps:
+        total_passengers = sum(dietary_counts.values())
+        if not total_passengers:
             return jsonify({'error': 'No passenger data available for download'}), 404
         
-        # Create CSV content
-        output = StringIO()
-        
-        # Write summary statistics first
-        total_passengers = len(rsvps)
-        dietary_counts = Counter([rsvp['dietary_option'] for rsvp in rsvps])
+        now = datetime.now()
         
         # Write header comments with summary
-        output.write(f"# Azalea Air Flight AA-2025 - Passenger Manifest\n")
-        output.write(f"# Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        output.write(f"# \n")
-        output.write(f"# FLIGHT SUMMARY\n")
-        output.write(f"# Total Passengers: {total_passengers}\n")
-        output.write(f"# \n")
-        output.write(f"# MEAL SERVICE SUMMARY\n")
-        
-        # Format dietary options for summary
-        # Bento box + legacy mapping
-        dietary_labels = {
-            'shrimp-aglio-olio': 'Shrimp Linguine Aglio Olio',
-            'creamy-chicken-pomodoro': 'Creamy Chicken Pomodoro',
-            'carbonara-funghi': 'Carbonara al Funghi (V)',
-            # legacy
-            'none': 'Standard Meal Service',
-            'vegetarian': 'Vegetarian Meals (VGML)',
-            'vegan': 'Vegan Meals (VEGN)',
-            'gluten-free': 'Gluten-Free Meals (GFML)',
-            'dairy-free': 'Dairy-Free Meals (DFML)',
-            'nut-free': 'Nut-Free Meals (NFML)',
-            'other': 'Special Dietary Requests'
-        }
+        header = [
+            "# Azalea Air Flight AA-2025 - Passenger Manifest\n",
+            f"# Generated on: {now.strftime('%Y-%m-%d %H:%M:%S')}\n",
+            "# \n",
+            "# FLIGHT SUMMARY\n",
+            f"# Total Passengers: {total_passengers}\n",
+            "# \n",
+            "# MEAL SERVICE SUMMARY\n",
+        ]
         
         for option, count in dietary_counts.items():
-            label = dietary_labels.get(option, option)
-            output.write(f"# {label}: {count}\n")
-        
-        output.write(f"# \n")
-        output.write(f"# ================================================\n")
-        output.write(f"# PASSENGER MANIFEST DATA\n")
-        output.write(f"# ================================================\n")
-        
-        # Write CSV header
-        writer = csv.writer(output)
-        writer.writerow([
-            'Passenger ID',
-            'Booking Date',
-            'Passenger Email',
-            'Meal Preference',
-            'Departure Date'
+            label = DIETARY_LABELS.get(option, option)
+            header.append(f"# {label}: {count}\n")
+        
+        header.extend([
+            "# \n",
+            "# ================================================\n",
+            "# PASSENGER MANIFEST DATA\n",
+            "# ================================================\n",
         ])
         
-        # Write passenger data
-        for rsvp in rsvps:
-            writer.writerow([
-                rsvp['id'],
-                rsvp['date_created'],
-                rsvp['email'],
-                dietary_labels.get(rsvp['dietary_option'], rsvp['dietary_option']),
-                rsvp['event_date']
+        def generate():
+            yield ''.join(header)
+            
+            # Write CSV header
+            writer = csv.writer(Echo())
+            yield writer.writerow([
+                'Passenger ID',
+                'Booking Date',
+                'Passenger Email',
+                'Meal Preference',
+                'Departure Date'
             ])
-        
-        # Create response
-        csv_content = output.getvalue()
-        output.close()
-        
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            
+            # Write passenger data, holding the connection until the last row
+            with db() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT id, date_created, email, dietary_option, event_date
+                    FROM rsvp
+                    ORDER BY date_created DESC
+                ''')
+                
+                for rsvp in cursor:
+                    yield writer.writerow([
+                        rsvp['id'],
+                        rsvp['date_created'],
+                        rsvp['email'],
+                        DIETARY_LABELS.get(rsvp['dietary_option'], rsvp['dietary_option']),
+                        rsvp['event_date']
+                    ])
+        
+        # Generate filename with the same timestamp as the header
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         filename = f'AzaleaAir_Flight_AA2025_Manifest_{timestamp}.csv'
         
         response = Response(
-            csv_content,
+            generate(),
             mimetype='text/csv',
             headers={'Content-Disposition': f'attachment; filename={filename}'}
         )
         
         return response
         
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    except (sqlite3.Error, KeyError, ValueError):
+        app.logger.exception('Failed to build passenger manifest')
+        return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/rsvp/summary')
 def get_rsvp_summary():
     """Get summary statistics for RSVP data."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT dietary_option FROM rsvp')
-        dietary_options = [row['dietary_option'] for row in cursor.fetchall()]
-        
-        cursor.execute('SELECT COUNT(*) as total FROM rsvp')
-        total_count = cursor.fetchone()['total']
-        
-        conn.close()
-        
-        # Count dietary options
-        dietary_counts = Counter(dietary_options)
+        with db() as conn:
+            dietary_counts = get_meal_counts(conn)
         
         # Format response
-        summary = {
-            'total_passengers': total_count,
-            'meal_summary': {}
+        meal_summary = {
+            option: {
+                'label': DIETARY_LABELS.get(option, option),
+                'count': count
+            }
+            for option, count in dietary_counts.items()
         }
         
-        dietary_labels = {
-            'shrimp-aglio-olio': 'Shrimp Linguine Aglio Olio',
-            'creamy-chicken-pomodoro': 'Creamy Chicken Pomodoro',
-            'carbonara-funghi': 'Carbonara al Funghi (V)',
-            # legacy
-            'none': 'Standard Meal Service',
-            'vegetarian': 'Vegetarian Meals (VGML)',
-            'vegan': 'Vegan Meals (VEGN)',
-            'gluten-free': 'Gluten-Free Meals (GFML)',
-            'dairy-free': 'Dairy-Free Meals (DFML)',
-            'nut-free': 'Nut-Free Meals (NFML)',
-            'other': 'Special Dietary Requests'
+        summary = {
+            'total_passengers': sum(dietary_counts.values()),
+            'meal_summary': meal_summary
         }
         
-        for option, count in dietary_counts.items():
-            label = dietary_labels.get(option, option)
-            summary['meal_summary'][option] = {
-                'label': label,
-                'count': count
-            }
-        
-        return jsonify(summary)
+        return ojsonify(summary)
         
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    except (sqlite3.Error, KeyError, ValueError):
+        app.logger.exception('Failed to build RSVP summary')
+        return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/boarding-pass/<int:rsvp_id>')
 def get_boarding_pass(rsvp_id):
     """Get boarding pass information for a specific RSVP."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, email, dietary_option, event_date, date_created
-            FROM rsvp WHERE id = ?
-        ''', (rsvp_id,))
-        
-        rsvp = cursor.fetchone()
-        conn.close()
+        with db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, email, dietary_option, event_date, date_created
+                FROM rsvp WHERE id = ?
+            ''', (rsvp_id,))
+            
+            rsvp = cursor.fetchone()
         
         if not rsvp:
             return jsonify({'error': 'Booking not found'}), 404
         
         # Generate boarding pass data (in production, this would be stored)
         confirmation_code = f"AZ{str(rsvp['id']).zfill(4)}"  # More consistent confirmation code
-        seat_number = generate_seat_number()
-        flight_times = format_boarding_time(rsvp['event_date'])
+        flight_times = format_boarding_time(rsvp['id'])
         
         # Get flight configuration
-        flight_number = get_flight_config('flight_number', 'AA-2025')
-        destination = get_flight_config('destination', 'Destination TBD')
-        
-        # Format departure date
-        departure_date_obj = datetime.strptime(rsvp['event_date'], '%Y-%m-%d').date()
-        formatted_departure = departure_date_obj.strftime('%B %d, %Y')
-        
-        boarding_pass = {
-            'confirmation_code': confirmation_code,
-            'passenger_email': rsvp['email'],
-            'flight_number': flight_number,
-            'departure_date': rsvp['event_date'],
-            'formatted_departure': formatted_departure,
-            'destination': destination,
-            'seat_number': seat_number,
-            'gate': flight_times['gate'],
-            'boarding_time': flight_times['boarding_time'],
-            'departure_time': flight_times['departure_time'],
-            'meal_preference': rsvp['dietary_option'],
-            'booking_date': rsvp['date_created']
-        }
+        config = load_flight_config()
+        flight_number = config.values.get('flight_number', 'AA-2025')
+        destination = config.values.get('destination', 'Destination TBD')
+        
+        # Format departure date, reusing the cached form for the configured date
+        if config.formatted_departure is not None and rsvp['event_date'] == config.values.get('departure_date'):
+            formatted_departure = config.formatted_departure
+        else:
+            departure_date_obj = datetime.strptime(rsvp['event_date'], '%Y-%m-%d').date()
+            formatted_departure = departure_date_obj.strftime('%B %d, %Y')
+        
+        boarding_pass = BoardingPass(
+            confirmation_code=confirmation_code,
+            passenger_email=rsvp['email'],
+            flight_number=flight_number,
+            departure_date=rsvp['event_date'],
+            formatted_departure=formatted_departure,
+            destination=destination,
+            seat_number=SEAT_NUMBER,
+            gate=flight_times['gate'],
+            boarding_time=flight_times['boarding_time'],
+            departure_time=flight_times['departure_time'],
+            meal_preference=rsvp['dietary_option'],
+            booking_date=rsvp['date_created']
+        )
         
-        return jsonify(boarding_pass)
+        return ojsonify(boarding_pass)
         
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    except (sqlite3.Error, KeyError, ValueError):
+        app.logger.exception('Failed to load boarding pass %s', rsvp_id)
+        return jsonify({'error': 'Internal server error'}), 500
+
+# Initialize database on startup; in production the app is imported once by
+# the gunicorn master (--preload in scripts/start.sh) rather than run as a script
+init_database()
 
 if __name__ == '__main__':
-    # Initialize database on startup
-    init_database()
-    
-    # Get debug mode from environment
-    debug_mode = os.getenv('FLASK_ENV') != 'production'
+    # Development server only
+    debug_mode = os.getenv('FLASK_ENV') == 'development'
     
     app.run(debug=debug_mode, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -7,6 +7,8 @@ Configure flight departure date and other settings at runtime.
 import argparse
 import sqlite3
 import sys
+import time
+from contextlib import closing
 from datetime import datetime, date
 import os
 
@@ -14,23 +16,30 @@ def get_db_connection():
     """Get a connection to the SQLite database."""
     conn = sqlite3.connect('rsvp_database.db')
     conn.row_factory = sqlite3.Row
+    # Match the journal settings used by the web app so config writes don't
+    # block readers in the running server
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
     return conn
 
 def init_config_table():
     """Initialize the configuration table if it doesn't exist."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
+    with closing(get_db_connection()) as conn, conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS flight_config (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+def bump_config_version(cursor):
+    """Record a configuration change so running servers reload their cache."""
     cursor.execute('''
-        CREATE TABLE IF NOT EXISTS flight_config (
-            key TEXT PRIMARY KEY,
-            value TEXT NOT NULL,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+        INSERT OR REPLACE INTO flight_config (key, value, updated_at)
+        VALUES ('__version__', ?, CURRENT_TIMESTAMP)
+    ''', (str(time.time()),))
 
 def set_departure_date(departure_date_str):
     """Set the departure date for the flight."""
@@ -45,16 +54,13 @@ def set_departure_date(departure_date_str):
             return False
         
         # Store in database
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO flight_config (key, value, updated_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-        ''', ('departure_date', departure_date_str))
-        
-        conn.commit()
-        conn.close()
+        with closing(get_db_connection()) as conn, conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO flight_config (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            ''', ('departure_date', departure_date_str))
+            bump_config_version(cursor)
         
         print(f"✅ Flight departure date set to: {departure_date_str}")
         print(f"   Formatted: {departure_date.strftime('%A, %B %d, %Y')}")
@@ -71,16 +77,14 @@ def set_departure_date(departure_date_str):
 def get_departure_date():
     """Get the currently configured departure date."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT value, updated_at FROM flight_config 
-            WHERE key = 'departure_date'
-        ''')
-        
-        result = cursor.fetchone()
-        conn.close()
+        with closing(get_db_connection()) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT value, updated_at FROM flight_config 
+                WHERE key = 'departure_date'
+            ''')
+            
+            result = cursor.fetchone()
         
         if result:
             departure_date = datetime.strptime(result['value'], '%Y-%m-%d').date()
@@ -95,42 +99,37 @@ def get_departure_date():
 
 def set_flight_info(flight_number=None, destination=None):
     """Set flight number and destination."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
     try:
-        if flight_number:
-            cursor.execute('''
-                INSERT OR REPLACE INTO flight_config (key, value, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            ''', ('flight_number', flight_number))
-            print(f"✅ Flight number set to: {flight_number}")
-        
-        if destination:
-            cursor.execute('''
-                INSERT OR REPLACE INTO flight_config (key, value, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            ''', ('destination', destination))
-            print(f"✅ Destination set to: {destination}")
-        
-        conn.commit()
-        conn.close()
+        with closing(get_db_connection()) as conn, conn:
+            cursor = conn.cursor()
+            if flight_number:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO flight_config (key, value, updated_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                ''', ('flight_number', flight_number))
+                print(f"✅ Flight number set to: {flight_number}")
+            
+            if destination:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO flight_config (key, value, updated_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                ''', ('destination', destination))
+                print(f"✅ Destination set to: {destination}")
+            
+            bump_config_version(cursor)
         return True
         
     except Exception as e:
         print(f"❌ Database error: {str(e)}")
-        conn.close()
         return False
 
 def show_status():
     """Show current flight configuration."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT key, value, updated_at FROM flight_config ORDER BY key')
-        configs = cursor.fetchall()
-        conn.close()
+        with closing(get_db_connection()) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT key, value, updated_at FROM flight_config ORDER BY key')
+            configs = cursor.fetchall()
         
         print("✈️  Azalea Air Flight Configuration Status")
         print("=" * 45)
@@ -177,11 +176,10 @@ def show_status():
         print(f"🌍 Destination: {destination}")
         
         # Show passenger count  
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) as count FROM rsvp')
-        passenger_count = cursor.fetchone()['count']
-        conn.close()
+        with closing(get_db_connection()) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) as count FROM rsvp')
+            passenger_count = cursor.fetchone()['count']
         
         print(f"👥 Current Passengers: {passenger_count}")
         
@@ -46,5 +46,5 @@ else
 fi
 
 echo "🎉 Deployment completed successfully!"
-echo "📝 To start the application, run: python app.py"
+echo "📝 To start the application, run: bash scripts/start.sh"
 echo "🌐 The application will be available on port 5000"
\ No newline at end of file
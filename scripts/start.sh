@@ -0,0 +1,20 @@
+#!/bin/bash
+
+# 🛫 Azalea Air Start Script
+# Serves the application with gunicorn instead of the Flask development server
+
+set -e  # Exit on any error
+
+# Activate virtual environment if deploy.sh created one
+if [ -d "venv" ]; then
+    source venv/bin/activate
+fi
+
+# One worker process per CPU, each serving requests on a few threads.
+# --preload imports the app (and runs init_database) once in the master
+# before forking, instead of in every worker at the same time.
+WORKERS=${WORKERS:-$(nproc)}
+THREADS=${THREADS:-4}
+
+echo "🛫 Starting Azalea Air with $WORKERS workers x $THREADS threads on port 5000..."
+exec gunicorn --preload -w "$WORKERS" -k gthread --threads "$THREADS" -b 0.0.0.0:5000 app:app